@@ -1,11 +1,13 @@
 import os
-from pathlib import Path
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
-    QPushButton, QLineEdit, QFileDialog, QTextEdit
+    QPushButton, QFileDialog
 )
-from PyQt6.QtCore import QThread
+from PyQt6.QtCore import Qt, QThread
 
+from gui.theme import AMBER_BUTTON_STYLE
+from gui.paths import HOME_DIR, is_missing_file
+from gui.log_view import LogView
 from senders.ardupilot import ArduPilotSender
 
 
@@ -17,7 +19,7 @@ class ArduPilotTab(QWidget):
         self.bin_file = None
         self.sender_thread = None
         self.sender = None
-        self.last_directory = str(Path.home())
+        self.last_directory = HOME_DIR
         self.init_ui()
     
     def init_ui(self):
@@ -42,45 +44,32 @@ class ArduPilotTab(QWidget):
         self.send_btn = QPushButton("Send ArduPilot Log")
         self.send_btn.setEnabled(False)
         self.send_btn.clicked.connect(self.send_file)
-        self.send_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f59e0b;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d97706;
-            }
-            QPushButton:disabled {
-                background-color: #64748b;
-            }
-        """)
+        self.send_btn.setStyleSheet(AMBER_BUTTON_STYLE)
         layout.addWidget(self.send_btn)
         
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
+        self.output_text = LogView()
         layout.addWidget(self.output_text)
         
         self.setLayout(layout)
     
     def load_settings(self):
         """Load saved settings"""
+        self.setUpdatesEnabled(False)
         self.settings.beginGroup("ArduPilot")
         
         self.last_directory = self.settings.value(
             "last_directory",
-            str(Path.home())
+            HOME_DIR
         )
         
         last_file = self.settings.value("last_file", "")
-        if last_file and os.path.exists(last_file):
+        if last_file:
             self.bin_file = last_file
             self.file_label.setText(os.path.basename(last_file))
             self.send_btn.setEnabled(True)
         
         self.settings.endGroup()
+        self.setUpdatesEnabled(True)
     
     def save_settings(self):
         """Save current settings"""
@@ -103,23 +92,29 @@ class ArduPilotTab(QWidget):
         
         if file_path:
             self.bin_file = file_path
-            self.last_directory = str(Path(file_path).parent)
+            self.last_directory = os.path.dirname(file_path)
             self.file_label.setText(os.path.basename(file_path))
             self.send_btn.setEnabled(True)
-            self.log_output(f"Selected: {file_path}")
+            self.output_text.log(f"Selected: {file_path}")
     
     def send_file(self):
         if not self.bin_file:
             return
         
+        if is_missing_file(self.bin_file):
+            self.output_text.log(f"✗ File not found: {self.bin_file}")
+            return
+        
         host = self.receiver_tab.get_host()
         port = self.receiver_tab.get_port()
         
         self.send_btn.setEnabled(False)
-        self.output_text.clear()
+        self.output_text.reset()
         
         self.sender = ArduPilotSender(self.bin_file, host, port)
-        self.sender.log_signal.connect(self.log_output)
+        self.sender.log_signal.connect(
+            self.output_text.log, Qt.ConnectionType.QueuedConnection
+        )
         self.sender.finished_signal.connect(self.on_finished)
         
         self.sender_thread = QThread()
@@ -131,9 +126,3 @@ class ArduPilotTab(QWidget):
         self.sender_thread.quit()
         self.sender_thread.wait()
         self.send_btn.setEnabled(True)
-    
-    def log_output(self, text):
-        self.output_text.append(text)
-        self.output_text.verticalScrollBar().setValue(
-            self.output_text.verticalScrollBar().maximum()
-        )
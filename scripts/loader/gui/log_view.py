@@ -0,0 +1,42 @@
+from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtCore import QTimer
+
+
+class LogView(QTextEdit):
+    """Read-only log output shared by the sender tabs"""
+    
+    # Lines are batched and appended at most once per FLUSH_INTERVAL_MS
+    FLUSH_INTERVAL_MS = 50
+    MAX_BLOCKS = 5000
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.document().setMaximumBlockCount(self.MAX_BLOCKS)
+        self.scrollbar = self.verticalScrollBar()
+        
+        self.buffer = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+    
+    def log(self, text):
+        self.buffer.append(text)
+        if not self.timer.isActive():
+            self.timer.start()
+    
+    def flush(self):
+        self.timer.stop()
+        if not self.buffer:
+            return
+        
+        self.append('\n'.join(self.buffer))
+        self.buffer.clear()
+        self.scrollbar.setValue(self.scrollbar.maximum())
+    
+    def reset(self):
+        """Drop pending lines and clear the view"""
+        self.timer.stop()
+        self.buffer.clear()
+        self.clear()
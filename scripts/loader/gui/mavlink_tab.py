@@ -1,42 +1,144 @@
 import os
-from pathlib import Path
+import sys
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
-    QPushButton, QLineEdit, QFileDialog, QSpinBox, QTextEdit,
+    QPushButton, QLineEdit, QFileDialog, QSpinBox,
     QRadioButton, QButtonGroup, QDoubleSpinBox, QMessageBox, QComboBox
 )
-from PyQt6.QtCore import QThread
+from PyQt6.QtCore import (
+    Qt, QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal
+)
 
+from gui.theme import GREEN_BUTTON_STYLE, RED_BUTTON_STYLE
+from gui.paths import HOME_DIR, is_missing_file
+from gui.log_view import LogView
 from senders.mavlink import MAVLinkStreamer
 
 
+DEV_DIR = "/dev"
+SERIAL_BY_ID_DIR = "/dev/serial/by-id"
+
+_PORTS_CACHE = {'mtime': None, 'dev_mtime': None, 'ports': None}
+
+# Fully-qualified settings keys, so load/save need no beginGroup/endGroup
+_MAV_KEYS = {
+    "mode": "MAVLink/mode",
+    "serial_device": "MAVLink/serial_device",
+    "baudrate": "MAVLink/baudrate",
+    "tcp_address": "MAVLink/tcp_address",
+    "tcp_port": "MAVLink/tcp_port",
+    "udp_address": "MAVLink/udp_address",
+    "udp_port": "MAVLink/udp_port",
+    "last_directory": "MAVLink/last_directory",
+    "last_file": "MAVLink/last_file",
+    "rate": "MAVLink/rate",
+}
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def get_serial_ports():
-    """Get list of available serial ports from /dev/serial/by-id/"""
+    """Get list of available serial ports from /dev/serial/by-id/
+    
+    The result is cached until the directory listing changes (hotplug
+    updates the directory mtime), so repeated refreshes cost a single stat.
+    When by-id exists but lists no ports, the /dev fallback was scanned and
+    its mtime is checked as well.
+    """
+    by_id_mtime = _dir_mtime(SERIAL_BY_ID_DIR)
+    if by_id_mtime is not None:
+        mtime = ('by-id', by_id_mtime)
+    else:
+        mtime = ('dev', _dir_mtime(DEV_DIR))
+    
+    if mtime == _PORTS_CACHE['mtime']:
+        dev_mtime = _PORTS_CACHE['dev_mtime']
+        if dev_mtime is None or dev_mtime == _dir_mtime(DEV_DIR):
+            return _PORTS_CACHE['ports']
+    
     ports = []
-    by_id_path = Path("/dev/serial/by-id")
+    dev_mtime = None
     
-    if by_id_path.exists():
-        for device in sorted(by_id_path.iterdir()):
-            if device.is_symlink():
-                real_path = device.resolve()
-                ports.append({
-                    'path': str(real_path),
-                    'name': device.name,
-                    'display': f"{device.name} ({real_path.name})"
-                })
+    if mtime[0] == 'by-id':
+        try:
+            with os.scandir(SERIAL_BY_ID_DIR) as it:
+                links = sorted(
+                    (entry.name, entry.path) for entry in it if entry.is_symlink()
+                )
+        except OSError:
+            links = []
+        
+        # Only the link target is needed, so readlink instead of resolving
+        for name, link_path in links:
+            # The device may have been unplugged since the listing
+            try:
+                target = os.readlink(link_path)
+            except OSError:
+                continue
+            real_path = os.path.normpath(os.path.join(SERIAL_BY_ID_DIR, target))
+            ports.append({
+                'path': real_path,
+                'name': name,
+                'display': f"{name} ({os.path.basename(real_path)})"
+            })
     
     if not ports:
-        for device_pattern in ["/dev/ttyACM*", "/dev/ttyUSB*"]:
-            for device in sorted(Path("/dev").glob(device_pattern[5:])):
-                ports.append({
-                    'path': str(device),
-                    'name': device.name,
-                    'display': device.name
-                })
+        # Taken before the scan, so a node added meanwhile invalidates the cache
+        if mtime[0] == 'by-id':
+            dev_mtime = _dir_mtime(DEV_DIR)
+        try:
+            with os.scandir(DEV_DIR) as it:
+                names = sorted(
+                    entry.name for entry in it
+                    if entry.name.startswith(("ttyACM", "ttyUSB"))
+                )
+        except OSError:
+            names = []
+        
+        for name in names:
+            ports.append({
+                'path': os.path.join(DEV_DIR, name),
+                'name': name,
+                'display': name
+            })
     
+    _PORTS_CACHE['mtime'] = mtime
+    _PORTS_CACHE['dev_mtime'] = dev_mtime
+    _PORTS_CACHE['ports'] = ports
     return ports
 
 
+class PortScanSignals(QObject):
+    ports_ready = pyqtSignal(list)
+
+
+class PortScanWorker(QRunnable):
+    """Runs get_serial_ports() on the global thread pool and reports through the tab's signals"""
+    
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+    
+    def run(self):
+        # Always emit: the tab only starts a new scan once this one reports
+        try:
+            ports = get_serial_ports()
+        except Exception:
+            ports = []
+        
+        # The signals are owned by the tab; once it is destroyed there is
+        # nobody left to report to
+        try:
+            self.signals.ports_ready.emit(ports)
+        except RuntimeError:
+            pass
+
+
 class MAVLinkTab(QWidget):
     def __init__(self, settings, receiver_tab):
         super().__init__()
@@ -45,7 +147,10 @@ class MAVLinkTab(QWidget):
         self.streamer = None
         self.streamer_thread = None
         self.mavlink_file = None
-        self.last_directory = str(Path.home())
+        self.last_directory = HOME_DIR
+        self.port_scan = None
+        self.port_scan_signals = PortScanSignals(self)
+        self.port_scan_signals.ports_ready.connect(self.on_ports_ready)
         self.init_ui()
     
     def init_ui(self):
@@ -189,81 +294,86 @@ class MAVLinkTab(QWidget):
         
         self.start_btn = QPushButton("Start Streaming")
         self.start_btn.clicked.connect(self.start_streaming)
-        self.start_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #10b981;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #059669;
-            }
-            QPushButton:disabled {
-                background-color: #64748b;
-            }
-        """)
+        self.start_btn.setStyleSheet(GREEN_BUTTON_STYLE)
         button_layout.addWidget(self.start_btn)
         
         self.stop_btn = QPushButton("Stop Streaming")
         self.stop_btn.clicked.connect(self.stop_streaming)
         self.stop_btn.setEnabled(False)
-        self.stop_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ef4444;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #dc2626;
-            }
-            QPushButton:disabled {
-                background-color: #64748b;
-            }
-        """)
+        self.stop_btn.setStyleSheet(RED_BUTTON_STYLE)
         button_layout.addWidget(self.stop_btn)
         
         layout.addLayout(button_layout)
         
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("font-family: monospace; padding: 4px;")
+        layout.addWidget(self.status_label)
+        
+        self.output_text = LogView()
         layout.addWidget(self.output_text)
         
         self.setLayout(layout)
         
-        # Initialize serial ports
-        self.refresh_serial_ports()
+        # Scan serial ports once the event loop is running so the first
+        # paint is not blocked; load_settings fills in the last device
+        QTimer.singleShot(0, self.refresh_serial_ports)
     
     def refresh_serial_ports(self):
         """Refresh the list of available serial ports"""
-        current_text = self.device_combo.currentText()
-        self.device_combo.clear()
+        # Only Linux walks /dev; elsewhere the scan is trivial, keep it inline
+        if not sys.platform.startswith("linux"):
+            self.on_ports_ready(get_serial_ports())
+            return
         
-        ports = get_serial_ports()
+        if self.port_scan is not None:
+            return
         
+        self.port_scan = PortScanWorker(self.port_scan_signals)
+        QThreadPool.globalInstance().start(self.port_scan)
+    
+    def on_ports_ready(self, ports):
+        self.port_scan = None
+        
+        prev_text = self.device_combo.currentText()
+        prev_data = self.device_combo.currentData()
+        
+        # Repopulate without a relayout or model signal per inserted row
+        self.device_combo.setUpdatesEnabled(False)
+        self.device_combo.blockSignals(True)
+        self.device_combo.clear()
         if ports:
             for port in ports:
                 self.device_combo.addItem(port['display'], port['path'])
+        else:
+            self.device_combo.addItem("/dev/ttyACM0")
+        self.device_combo.blockSignals(False)
+        self.device_combo.setUpdatesEnabled(True)
+        
+        if ports:
+            # Try to restore previous selection: same device path first, then
+            # the displayed entry, then a typed path matching a device
+            index = -1
+            if prev_data:
+                index = self.device_combo.findData(prev_data)
+            if index < 0 and prev_text:
+                index = self.device_combo.findText(prev_text)
+            if index < 0 and prev_text:
+                index = self.device_combo.findData(prev_text)
             
-            # Try to restore previous selection
-            index = self.device_combo.findData(current_text)
             if index >= 0:
                 self.device_combo.setCurrentIndex(index)
-            elif current_text:
+            elif prev_text:
                 # If not found in dropdown, keep it as editable text
-                self.device_combo.setEditText(current_text)
-        else:
-            self.device_combo.addItem("/dev/ttyACM0")
+                self.device_combo.setEditText(prev_text)
+        elif prev_text:
+            self.device_combo.setEditText(prev_text)
     
     def load_settings(self):
         """Load saved settings"""
-        self.settings.beginGroup("MAVLink")
+        self.setUpdatesEnabled(False)
         
         # Load connection mode
-        mode = int(self.settings.value("mode", 0))
+        mode = int(self.settings.value(_MAV_KEYS["mode"], 0))
         if mode == 0:
             self.serial_radio.setChecked(True)
         elif mode == 1:
@@ -274,64 +384,59 @@ class MAVLinkTab(QWidget):
             self.file_radio.setChecked(True)
         
         # Load serial settings
-        serial_device = self.settings.value("serial_device", "/dev/ttyACM0")
+        serial_device = self.settings.value(_MAV_KEYS["serial_device"], "/dev/ttyACM0")
         self.device_combo.setEditText(serial_device)
-        self.baud_input.setValue(int(self.settings.value("baudrate", 115200)))
+        self.baud_input.setValue(int(self.settings.value(_MAV_KEYS["baudrate"], 115200)))
         
         # Load TCP settings
-        self.tcp_addr_input.setText(self.settings.value("tcp_address", "0.0.0.0"))
-        self.tcp_port_input.setValue(int(self.settings.value("tcp_port", 5760)))
+        self.tcp_addr_input.setText(self.settings.value(_MAV_KEYS["tcp_address"], "0.0.0.0"))
+        self.tcp_port_input.setValue(int(self.settings.value(_MAV_KEYS["tcp_port"], 5760)))
         
         # Load UDP settings
-        self.udp_addr_input.setText(self.settings.value("udp_address", "127.0.0.1"))
-        self.udp_port_input.setValue(int(self.settings.value("udp_port", 14550)))
+        self.udp_addr_input.setText(self.settings.value(_MAV_KEYS["udp_address"], "127.0.0.1"))
+        self.udp_port_input.setValue(int(self.settings.value(_MAV_KEYS["udp_port"], 14550)))
         
         # Load file settings
         self.last_directory = self.settings.value(
-            "last_directory",
-            str(Path.home())
+            _MAV_KEYS["last_directory"],
+            HOME_DIR
         )
-        last_file = self.settings.value("last_file", "")
-        if last_file and os.path.exists(last_file):
+        last_file = self.settings.value(_MAV_KEYS["last_file"], "")
+        if last_file:
             self.mavlink_file = last_file
             self.file_label.setText(os.path.basename(last_file))
         
         # Load streaming settings
-        self.rate_input.setValue(float(self.settings.value("rate", 10.0)))
-        
-        self.settings.endGroup()
+        self.rate_input.setValue(float(self.settings.value(_MAV_KEYS["rate"], 10.0)))
         
         # Update UI based on loaded mode
         self.on_mode_changed()
+        self.setUpdatesEnabled(True)
     
     def save_settings(self):
         """Save current settings"""
-        self.settings.beginGroup("MAVLink")
-        
         # Save connection mode
-        self.settings.setValue("mode", self.mode_group.checkedId())
+        self.settings.setValue(_MAV_KEYS["mode"], self.mode_group.checkedId())
         
         # Save serial settings
-        self.settings.setValue("serial_device", self.device_combo.currentText())
-        self.settings.setValue("baudrate", self.baud_input.value())
+        self.settings.setValue(_MAV_KEYS["serial_device"], self.device_combo.currentText())
+        self.settings.setValue(_MAV_KEYS["baudrate"], self.baud_input.value())
         
         # Save TCP settings
-        self.settings.setValue("tcp_address", self.tcp_addr_input.text())
-        self.settings.setValue("tcp_port", self.tcp_port_input.value())
+        self.settings.setValue(_MAV_KEYS["tcp_address"], self.tcp_addr_input.text())
+        self.settings.setValue(_MAV_KEYS["tcp_port"], self.tcp_port_input.value())
         
         # Save UDP settings
-        self.settings.setValue("udp_address", self.udp_addr_input.text())
-        self.settings.setValue("udp_port", self.udp_port_input.value())
+        self.settings.setValue(_MAV_KEYS["udp_address"], self.udp_addr_input.text())
+        self.settings.setValue(_MAV_KEYS["udp_port"], self.udp_port_input.value())
         
         # Save file settings
-        self.settings.setValue("last_directory", self.last_directory)
+        self.settings.setValue(_MAV_KEYS["last_directory"], self.last_directory)
         if self.mavlink_file:
-            self.settings.setValue("last_file", self.mavlink_file)
+            self.settings.setValue(_MAV_KEYS["last_file"], self.mavlink_file)
         
         # Save streaming settings
-        self.settings.setValue("rate", self.rate_input.value())
-        
-        self.settings.endGroup()
+        self.settings.setValue(_MAV_KEYS["rate"], self.rate_input.value())
     
     def on_mode_changed(self):
         mode_id = self.mode_group.checkedId()
@@ -352,7 +457,7 @@ class MAVLinkTab(QWidget):
         if file_path:
             self.file_label.setText(os.path.basename(file_path))
             self.mavlink_file = file_path
-            self.last_directory = str(Path(file_path).parent)
+            self.last_directory = os.path.dirname(file_path)
     
     def start_streaming(self):
         mode_id = self.mode_group.checkedId()
@@ -378,17 +483,25 @@ class MAVLinkTab(QWidget):
             if not self.mavlink_file:
                 QMessageBox.warning(self, "Error", "Please select a MAVLink log file")
                 return
+            if is_missing_file(self.mavlink_file):
+                QMessageBox.warning(self, "Error", f"File not found: {self.mavlink_file}")
+                return
             connection_str = self.mavlink_file
         
         host = self.receiver_tab.get_host()
         port = self.receiver_tab.get_port()
         rate = self.rate_input.value()
         
-        self.output_text.clear()
+        self.output_text.reset()
+        self.status_label.clear()
         
         self.streamer = MAVLinkStreamer(connection_str, baudrate, host, port, rate)
-        self.streamer.log_signal.connect(self.log_output)
-        self.streamer.status_signal.connect(self.update_status)
+        self.streamer.log_signal.connect(
+            self.output_text.log, Qt.ConnectionType.QueuedConnection
+        )
+        self.streamer.status_signal.connect(
+            self.update_status, Qt.ConnectionType.QueuedConnection
+        )
         
         self.streamer_thread = QThread()
         self.streamer.moveToThread(self.streamer_thread)
@@ -400,7 +513,7 @@ class MAVLinkTab(QWidget):
     
     def stop_streaming(self):
         if self.streamer:
-            self.log_output("\nStopping stream...")
+            self.output_text.log("\nStopping stream...")
             self.streamer.stop()
         
         if self.streamer_thread:
@@ -410,22 +523,5 @@ class MAVLinkTab(QWidget):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
     
-    def log_output(self, text):
-        self.output_text.append(text)
-        self.output_text.verticalScrollBar().setValue(
-            self.output_text.verticalScrollBar().maximum()
-        )
-    
     def update_status(self, text):
-        cursor = self.output_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.movePosition(cursor.MoveOperation.StartOfLine, cursor.MoveMode.KeepAnchor)
-        
-        selected = cursor.selectedText()
-        if selected and selected[0].isdigit():
-            cursor.removeSelectedText()
-            cursor.deletePreviousChar()
-        
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.output_text.setTextCursor(cursor)
-        self.output_text.insertPlainText(text + '\n')
+        self.status_label.setText(text)
@@ -0,0 +1,11 @@
+import os
+from pathlib import Path
+
+
+HOME_DIR = str(Path.home())
+CONFIG_DIR = Path(HOME_DIR) / ".config" / "tiplot"
+
+
+def is_missing_file(path):
+    """Whether a remembered path no longer names a file; saved paths are not checked at startup"""
+    return not os.path.isfile(path)
@@ -0,0 +1,59 @@
+def _same_value(cached, value):
+    """Whether a cached value already holds value; INI backends read everything back as strings"""
+    if cached == value:
+        return True
+    if not isinstance(cached, str) or not isinstance(value, (bool, int, float)):
+        return False
+    if isinstance(value, bool):
+        return cached.lower() == ("true" if value else "false")
+    try:
+        return type(value)(cached) == value
+    except ValueError:
+        return False
+
+
+class SettingsCache:
+    """In-memory view over a QSettings store.
+    
+    All keys are read once on construction; reads are served from a dict
+    and writes are only pushed back to the backend on sync(), and only for
+    keys whose value actually changed.
+    """
+    
+    def __init__(self, settings):
+        self.settings = settings
+        self._cache = {key: settings.value(key) for key in settings.allKeys()}
+        self._dirty = set()
+        self._groups = []
+    
+    def _key(self, key):
+        if not self._groups:
+            return key
+        return "/".join(self._groups) + "/" + key
+    
+    def beginGroup(self, prefix):
+        self._groups.append(prefix)
+    
+    def endGroup(self):
+        if self._groups:
+            self._groups.pop()
+    
+    def value(self, key, default=None):
+        return self._cache.get(self._key(key), default)
+    
+    def setValue(self, key, value):
+        full_key = self._key(key)
+        if full_key in self._cache and _same_value(self._cache[full_key], value):
+            return
+        self._cache[full_key] = value
+        self._dirty.add(full_key)
+    
+    def sync(self):
+        """Write changed keys back to the backend in one batch"""
+        if not self._dirty:
+            return
+        
+        for key in self._dirty:
+            self.settings.setValue(key, self._cache[key])
+        self._dirty.clear()
+        self.settings.sync()
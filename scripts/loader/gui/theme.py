@@ -0,0 +1,139 @@
+STYLESHEET = """
+QMainWindow {
+    background-color: #1e293b;
+}
+QWidget {
+    background-color: #1e293b;
+    color: #e2e8f0;
+}
+QScrollArea {
+    border: none;
+    background-color: #1e293b;
+}
+QGroupBox {
+    border: 1px solid #475569;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 10px;
+    font-weight: bold;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px;
+}
+QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox {
+    background-color: #334155;
+    border: 1px solid #475569;
+    border-radius: 3px;
+    padding: 5px;
+    color: #e2e8f0;
+}
+QComboBox::drop-down {
+    border: none;
+}
+QComboBox::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid #e2e8f0;
+    margin-right: 5px;
+}
+QTextEdit {
+    background-color: #0f172a;
+    border: 1px solid #475569;
+    border-radius: 3px;
+    color: #e2e8f0;
+    font-family: monospace;
+}
+QPushButton {
+    background-color: #475569;
+    color: white;
+    border: none;
+    border-radius: 3px;
+    padding: 8px 16px;
+}
+QPushButton:hover {
+    background-color: #64748b;
+}
+QTabWidget::pane {
+    border: 1px solid #475569;
+    background-color: #1e293b;
+}
+QTabBar::tab {
+    background-color: #334155;
+    color: #94a3b8;
+    padding: 10px 20px;
+    border-top-left-radius: 5px;
+    border-top-right-radius: 5px;
+}
+QTabBar::tab:selected {
+    background-color: #1e293b;
+    color: #3b82f6;
+    border-bottom: 2px solid #3b82f6;
+}
+QRadioButton {
+    spacing: 5px;
+}
+QRadioButton::indicator {
+    width: 15px;
+    height: 15px;
+}
+QScrollBar:vertical {
+    background-color: #1e293b;
+    width: 12px;
+    border-radius: 6px;
+}
+QScrollBar::handle:vertical {
+    background-color: #475569;
+    border-radius: 6px;
+    min-height: 20px;
+}
+QScrollBar::handle:vertical:hover {
+    background-color: #64748b;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QScrollBar:horizontal {
+    background-color: #1e293b;
+    height: 12px;
+    border-radius: 6px;
+}
+QScrollBar::handle:horizontal {
+    background-color: #475569;
+    border-radius: 6px;
+    min-width: 20px;
+}
+QScrollBar::handle:horizontal:hover {
+    background-color: #64748b;
+}
+QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+    width: 0px;
+}
+"""
+
+
+def _button_style(background, hover):
+    return f"""
+QPushButton {{
+    background-color: {background};
+    color: white;
+    padding: 10px;
+    border-radius: 5px;
+    font-weight: bold;
+}}
+QPushButton:hover {{
+    background-color: {hover};
+}}
+QPushButton:disabled {{
+    background-color: #64748b;
+}}
+"""
+
+
+# Built once at import so every tab instance hands Qt the same string
+BLUE_BUTTON_STYLE = _button_style("#3b82f6", "#2563eb")
+AMBER_BUTTON_STYLE = _button_style("#f59e0b", "#d97706")
+GREEN_BUTTON_STYLE = _button_style("#10b981", "#059669")
+RED_BUTTON_STYLE = _button_style("#ef4444", "#dc2626")
@@ -1,11 +1,13 @@
 import os
-from pathlib import Path
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
-    QPushButton, QLineEdit, QFileDialog, QTextEdit
+    QPushButton, QFileDialog, QCheckBox
 )
-from PyQt6.QtCore import QThread
+from PyQt6.QtCore import Qt, QThread
 
+from gui.theme import BLUE_BUTTON_STYLE
+from gui.paths import HOME_DIR, is_missing_file
+from gui.log_view import LogView
 from senders.ulg import ULGSender
 
 
@@ -17,7 +19,7 @@ class ULGTab(QWidget):
         self.ulg_file = None
         self.sender_thread = None
         self.sender = None
-        self.last_directory = str(Path.home())
+        self.last_directory = HOME_DIR
         self.init_ui()
     
     def init_ui(self):
@@ -36,51 +38,47 @@ class ULGTab(QWidget):
         file_select_layout.addWidget(self.browse_btn)
         
         file_layout.addLayout(file_select_layout)
+        
+        self.compress_check = QCheckBox("Compress record batches (LZ4)")
+        self.compress_check.setToolTip(
+            "Only worth it on slow links; the viewer must support compressed IPC streams"
+        )
+        file_layout.addWidget(self.compress_check)
+        
         file_group.setLayout(file_layout)
         layout.addWidget(file_group)
         
         self.send_btn = QPushButton("Send ULG File")
         self.send_btn.setEnabled(False)
         self.send_btn.clicked.connect(self.send_file)
-        self.send_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3b82f6;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2563eb;
-            }
-            QPushButton:disabled {
-                background-color: #64748b;
-            }
-        """)
+        self.send_btn.setStyleSheet(BLUE_BUTTON_STYLE)
         layout.addWidget(self.send_btn)
         
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
+        self.output_text = LogView()
         layout.addWidget(self.output_text)
         
         self.setLayout(layout)
     
     def load_settings(self):
         """Load saved settings"""
+        self.setUpdatesEnabled(False)
         self.settings.beginGroup("ULG")
         
         self.last_directory = self.settings.value(
             "last_directory",
-            str(Path.home())
+            HOME_DIR
         )
         
         last_file = self.settings.value("last_file", "")
-        if last_file and os.path.exists(last_file):
+        if last_file:
             self.ulg_file = last_file
             self.file_label.setText(os.path.basename(last_file))
             self.send_btn.setEnabled(True)
         
+        self.compress_check.setChecked(self.settings.value("compress", "false") in (True, "true"))
+        
         self.settings.endGroup()
+        self.setUpdatesEnabled(True)
     
     def save_settings(self):
         """Save current settings"""
@@ -91,6 +89,8 @@ class ULGTab(QWidget):
         if self.ulg_file:
             self.settings.setValue("last_file", self.ulg_file)
         
+        self.settings.setValue("compress", self.compress_check.isChecked())
+        
         self.settings.endGroup()
     
     def browse_file(self):
@@ -103,23 +103,30 @@ class ULGTab(QWidget):
         
         if file_path:
             self.ulg_file = file_path
-            self.last_directory = str(Path(file_path).parent)
+            self.last_directory = os.path.dirname(file_path)
             self.file_label.setText(os.path.basename(file_path))
             self.send_btn.setEnabled(True)
-            self.log_output(f"Selected: {file_path}")
+            self.output_text.log(f"Selected: {file_path}")
     
     def send_file(self):
         if not self.ulg_file:
             return
         
+        if is_missing_file(self.ulg_file):
+            self.output_text.log(f"✗ File not found: {self.ulg_file}")
+            return
+        
         host = self.receiver_tab.get_host()
         port = self.receiver_tab.get_port()
         
         self.send_btn.setEnabled(False)
-        self.output_text.clear()
+        self.output_text.reset()
         
-        self.sender = ULGSender(self.ulg_file, host, port)
-        self.sender.log_signal.connect(self.log_output)
+        compression = ULGSender.LZ4 if self.compress_check.isChecked() else None
+        self.sender = ULGSender(self.ulg_file, host, port, compression)
+        self.sender.log_signal.connect(
+            self.output_text.log, Qt.ConnectionType.QueuedConnection
+        )
         self.sender.finished_signal.connect(self.on_finished)
         
         self.sender_thread = QThread()
@@ -131,9 +138,3 @@ class ULGTab(QWidget):
         self.sender_thread.quit()
         self.sender_thread.wait()
         self.send_btn.setEnabled(True)
-    
-    def log_output(self, text):
-        self.output_text.append(text)
-        self.output_text.verticalScrollBar().setValue(
-            self.output_text.verticalScrollBar().maximum()
-        )
@@ -3,10 +3,12 @@ import sys
 from PyQt6.QtWidgets import QApplication
 
 from gui.main_window import MainWindow
+from gui.theme import STYLESHEET
 
 
 def main():
     app = QApplication(sys.argv)
+    app.setStyleSheet(STYLESHEET)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
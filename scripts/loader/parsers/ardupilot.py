@@ -1,9 +1,112 @@
+import contextlib
+import mmap
+import os
+import re
 import struct
+import sys
 from enum import IntEnum
+from types import MappingProxyType
 from dataclasses import dataclass
-from typing import Dict, List, Any, Optional, BinaryIO
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 
+import numpy as np
+
+
+FORMAT_MAP = MappingProxyType({
+    'a': '64s', 'b': 'b', 'B': 'B', 'h': 'h', 'H': 'H',
+    'i': 'i', 'I': 'I', 'f': 'f', 'd': 'd',
+    'n': '4s', 'N': '16s', 'Z': '64s',
+    'c': 'h', 'C': 'H', 'e': 'i', 'E': 'I',
+    'L': 'i', 'M': 'B', 'q': 'q', 'Q': 'Q',
+})
+
+DTYPE_MAP = MappingProxyType({
+    'a': 'S64', 'b': '<i1', 'B': '<u1', 'h': '<i2', 'H': '<u2',
+    'i': '<i4', 'I': '<u4', 'f': '<f4', 'd': '<f8',
+    'n': 'S4', 'N': 'S16', 'Z': 'S64',
+    'c': '<i2', 'C': '<u2', 'e': '<i4', 'E': '<u4',
+    'L': '<i4', 'M': '<u1', 'q': '<i8', 'Q': '<u8',
+})
+
+# Fixed layouts of the FMT (type, length, name, format, columns) and MSG
+# (TimeUS, text) payloads
+FMT_STRUCT = struct.Struct('<BB4s16s64s')
+TEXT_STRUCT = struct.Struct('<Q64s')
+
+
+# Message, field and parameter names repeat across FMT and PARM records;
+# each distinct raw name is decoded once and shared as an interned str.
+_NAME_CACHE: Dict[bytes, str] = {}
+
+
+def decode_name(raw: bytes) -> str:
+    name = _NAME_CACHE.get(raw)
+    if name is None:
+        name = sys.intern(raw.rstrip(b'\x00').decode('ascii', errors='ignore'))
+        _NAME_CACHE[raw] = name
+    return name
+
+
+def rename_fields(records: np.ndarray, renames: Dict[str, str]) -> np.ndarray:
+    """View of records with some fields renamed; the data is not copied"""
+    fields = records.dtype.fields
+    return records.view(np.dtype({
+        'names': [renames.get(name, name) for name in records.dtype.names],
+        'formats': [fields[name][0] for name in records.dtype.names],
+        'offsets': [fields[name][1] for name in records.dtype.names],
+        'itemsize': records.dtype.itemsize,
+    }))
+
+
+def merge_records(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Concatenate two batches of one message type whose record layouts differ.
+    
+    This happens when an FMT redefinition keeps the name but changes the
+    fields. Fields are matched by name and promoted to a common type; a
+    field that only one batch has is left as NaN (numbers) or empty
+    (strings) for the other batch's rows. A field that is a string on one
+    side and a number on the other cannot share a column, so its string
+    values go to a separate '<name>_str' column.
+    """
+    conflicts = [
+        name for name in first.dtype.names
+        if name in second.dtype.names and (first.dtype[name].kind == 'S') != (second.dtype[name].kind == 'S')
+    ]
+    if conflicts:
+        first, second = (
+            rename_fields(part, {name: f'{name}_str' for name in conflicts if part.dtype[name].kind == 'S'})
+            for part in (first, second)
+        )
+    
+    fields = []
+    for name in first.dtype.names + tuple(n for n in second.dtype.names if n not in first.dtype.names):
+        types = [part.dtype[name] for part in (first, second) if name in part.dtype.names]
+        dtype = np.promote_types(*types) if len(types) == 2 else types[0]
+        if len(types) == 1 and dtype.kind != 'S':
+            dtype = np.promote_types(dtype, np.float64)
+        fields.append((name, dtype))
+    
+    merged = np.empty(len(first) + len(second), dtype=fields)
+    for rows, part in ((merged[:len(first)], first), (merged[len(first):], second)):
+        for name, dtype in fields:
+            if name in part.dtype.names:
+                rows[name] = part[name]
+            else:
+                rows[name] = b'' if dtype.kind == 'S' else np.nan
+    return merged
+
+
+def sort_by_time(records: np.ndarray) -> np.ndarray:
+    """Records in TimeUS order; input that is already in order is returned as is"""
+    if 'TimeUS' not in records.dtype.names:
+        return records
+    
+    time_us = records['TimeUS']
+    if np.all(time_us[1:] >= time_us[:-1]):
+        return records
+    return records[np.argsort(time_us, kind='stable')]
+
 
 class MessageType(IntEnum):
     FMT = 0x80
@@ -19,157 +122,234 @@ class FormatDefinition:
     format_chars: str
     field_names: List[str]
     
+    def __post_init__(self):
+        self.record_struct = struct.Struct(
+            '<' + ''.join(FORMAT_MAP.get(char, 'B') for char in self.format_chars)
+        )
+        self.dtype, self.columns = self._build_dtype()
+        self.output_dtype = np.dtype([
+            (name, np.float64 if scale is not None else self.dtype[name])
+            for name, scale in self.columns
+        ])
+    
     def get_struct_format(self) -> str:
-        format_map = {
-            'a': '64s', 'b': 'b', 'B': 'B', 'h': 'h', 'H': 'H',
-            'i': 'i', 'I': 'I', 'f': 'f', 'd': 'd',
-            'n': '4s', 'N': '16s', 'Z': '64s',
-            'c': 'h', 'C': 'H', 'e': 'i', 'E': 'I',
-            'L': 'i', 'M': 'B', 'q': 'q', 'Q': 'Q',
-        }
+        return self.record_struct.format
+    
+    def _build_dtype(self) -> Tuple[np.dtype, List[Tuple[str, Optional[float]]]]:
+        """Packed record dtype for one payload, plus the (name, scale) columns to keep"""
+        # Values without a name (or shadowed by a later field of the same
+        # name) are still part of the record layout but are not kept.
+        names = [
+            self.field_names[i] if i < len(self.field_names) else None
+            for i in range(len(self.format_chars))
+        ]
+        for i, name in enumerate(names):
+            if name is not None and name in names[i + 1:]:
+                names[i] = None
         
-        struct_format = '<'
-        for char in self.format_chars:
-            struct_format += format_map.get(char, 'B')
+        record_names = []
+        columns = []
+        for i, (name, char) in enumerate(zip(names, self.format_chars)):
+            if name is None:
+                record_names.append(f'_unused{i}')
+                continue
+            
+            record_names.append(name)
+            if char in ['c', 'C', 'e', 'E']:
+                columns.append((name, 100.0))
+            elif char == 'L':
+                columns.append((name, 1e7))
+            else:
+                columns.append((name, None))
         
-        return struct_format
+        dtype = np.dtype({
+            'names': record_names,
+            'formats': [DTYPE_MAP.get(char, '<u1') for char in self.format_chars],
+        })
+        return dtype, columns
 
 
 class ArduPilotBinParser:
     HEAD1 = 0xA3
     HEAD2 = 0x95
+    HEADER = bytes((HEAD1, HEAD2))
+    VEHICLE_RE = re.compile(r'Ardu(?:Plane|Copter|Rover|Sub)')
+    
+    # Upper bound on the index array built per gather step
+    GATHER_CHUNK = 1 << 20
     
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.formats: Dict[int, FormatDefinition] = {}
-        self.messages_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.messages_by_type: Dict[str, np.ndarray] = {}
         self.parameters: Dict[str, float] = {}
         self.text_messages: List[str] = []
         self.version_info: Dict[str, str] = {}
-        
+        self._reset_index()
+    
+    def _reset_index(self) -> None:
+        """Start an empty scan index: payload offsets per type, pending batches, data lengths"""
+        self._offsets: Dict[int, List[int]] = defaultdict(list)
+        self._batches: List[Tuple[FormatDefinition, List[int]]] = []
+        self._data_lengths: List[int] = [0] * 256
+    
     def parse(self) -> None:
-        with open(self.filepath, 'rb') as f:
-            while True:
-                msg = self._read_message(f)
-                if msg is None:
-                    break
+        """Index every data message in a first pass, then decode each type in bulk"""
+        try:
+            with open(self.filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
                 
-                if msg['type'] == 'FMT':
-                    self._process_fmt_message(msg)
-                elif msg['type'] == 'PARM':
-                    self._process_parm_message(msg)
-                elif msg['type'] == 'MSG':
-                    self._process_text_message(msg)
-                elif msg['type'] in ['UNIT', 'MULT', 'FMTU', 'UNKNOWN']:
-                    continue
-                else:
-                    self.messages_by_type[msg['type']].append(msg)
-    
-    def _read_message(self, f: BinaryIO) -> Optional[Dict[str, Any]]:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    self._scan(mm)
+                    
+                    for msg_type, offsets in self._offsets.items():
+                        self._batches.append((self.formats[msg_type], offsets))
+                    
+                    buf = np.frombuffer(mm, dtype=np.uint8)
+                    try:
+                        for fmt_def, offsets in self._batches:
+                            self._process_data_messages(fmt_def, self._decode_messages(buf, fmt_def, offsets))
+                    finally:
+                        del buf
+                finally:
+                    # Decoded arrays are copies, but a propagating traceback can
+                    # still hold views of the map; closing would then raise
+                    # BufferError over the real error, so the map is left to be
+                    # released with the last view instead
+                    with contextlib.suppress(BufferError):
+                        mm.close()
+        finally:
+            # The offset lists hold one entry per message; drop them on every path
+            self._reset_index()
+    
+    def _scan(self, mm: mmap.mmap) -> None:
+        # Plain data messages make up nearly all of a log, so they are
+        # indexed inline through a flat length table; FMT, MSG and anything
+        # unusual go through _read_message.
+        find = mm.find
+        header = self.HEADER
+        size = len(mm)
+        data_lengths = self._data_lengths
+        offsets = self._offsets
+        
+        pos = 0
         while True:
-            byte = f.read(1)
-            if not byte:
-                return None
+            pos = find(header, pos)
+            if pos < 0 or pos + 2 >= size:
+                return
             
-            if byte[0] == self.HEAD1:
-                head2 = f.read(1)
-                if head2 and head2[0] == self.HEAD2:
-                    break
-        
-        msg_type_byte = f.read(1)
-        if not msg_type_byte:
+            msg_type = mm[pos + 2]
+            data_length = data_lengths[msg_type]
+            if data_length and pos + 3 + data_length <= size:
+                offsets[msg_type].append(pos + 3)
+                pos += 3 + data_length
+                continue
+            
+            pos = self._read_message(mm, pos)
+            if pos is None:
+                return
+    
+    def _read_message(self, mm: mmap.mmap, pos: int) -> Optional[int]:
+        """Handle the message at the next header from pos; returns where to continue"""
+        pos = mm.find(self.HEADER, pos)
+        if pos < 0 or pos + 2 >= len(mm):
             return None
         
-        msg_type = msg_type_byte[0]
+        msg_type = mm[pos + 2]
+        pos += 3
         
         if msg_type == ord('Y'):
-            actual_type = f.read(1)
-            if actual_type and actual_type[0] == MessageType.FMT:
-                return self._read_fmt_message(f)
+            if pos < len(mm) and mm[pos] == MessageType.FMT:
+                return self._read_fmt_message(mm, pos + 1)
+            pos += 1
         
         if msg_type == MessageType.FMT:
-            return self._read_fmt_message(f)
+            return self._read_fmt_message(mm, pos)
         
         if msg_type == MessageType.MSG:
-            return self._read_text_message(f)
+            return self._read_text_message(mm, pos)
         
         if msg_type in self.formats:
-            return self._read_data_message(f, msg_type)
-        else:
-            return {'type': 'UNKNOWN', 'msg_type': msg_type}
+            return self._read_data_message(mm, pos, msg_type)
+        
+        return pos
     
-    def _read_fmt_message(self, f: BinaryIO) -> Dict[str, Any]:
-        fmt_data = f.read(86)
-        if len(fmt_data) < 86:
+    def _read_fmt_message(self, mm: mmap.mmap, pos: int) -> Optional[int]:
+        if pos + FMT_STRUCT.size > len(mm):
             return None
         
-        msg_type, msg_length = struct.unpack_from('<BB', fmt_data, 0)
-        name = fmt_data[2:6].rstrip(b'\x00').decode('ascii', errors='ignore')
-        format_str = fmt_data[6:22].rstrip(b'\x00').decode('ascii', errors='ignore')
-        columns = fmt_data[22:86].rstrip(b'\x00').decode('ascii', errors='ignore')
+        msg_type, msg_length, raw_name, raw_format, raw_columns = FMT_STRUCT.unpack_from(mm, pos)
+        name = decode_name(raw_name)
+        format_str = raw_format.rstrip(b'\x00').decode('ascii', errors='ignore')
+        columns = raw_columns.rstrip(b'\x00').decode('ascii', errors='ignore')
         
-        field_names = [col.strip() for col in columns.split(',') if col.strip()]
+        field_names = [sys.intern(col.strip()) for col in columns.split(',') if col.strip()]
         
-        return {
+        self._process_fmt_message({
             'type': 'FMT',
             'msg_type': msg_type,
             'msg_length': msg_length,
             'name': name,
             'format': format_str,
             'columns': field_names
-        }
+        })
+        return pos + FMT_STRUCT.size
     
-    def _read_text_message(self, f: BinaryIO) -> Dict[str, Any]:
-        msg_data = f.read(72)
-        if len(msg_data) < 72:
+    def _read_text_message(self, mm: mmap.mmap, pos: int) -> Optional[int]:
+        if pos + TEXT_STRUCT.size > len(mm):
             return None
         
-        time_us, message = struct.unpack('<Q64s', msg_data)
+        time_us, message = TEXT_STRUCT.unpack_from(mm, pos)
         message = message.rstrip(b'\x00').decode('ascii', errors='ignore')
         
-        return {
+        self._process_text_message({
             'type': 'MSG',
             'TimeUS': time_us,
             'Message': message
-        }
+        })
+        return pos + TEXT_STRUCT.size
     
-    def _read_data_message(self, f: BinaryIO, msg_type: int) -> Optional[Dict[str, Any]]:
+    def _read_data_message(self, mm: mmap.mmap, pos: int, msg_type: int) -> Optional[int]:
+        """Record where the payload starts; decoding happens per type after the scan"""
         fmt_def = self.formats[msg_type]
         data_length = fmt_def.msg_length - 3
         
-        if data_length <= 0:
+        if data_length <= 0 or pos + data_length > len(mm):
             return None
         
-        data = f.read(data_length)
-        if len(data) < data_length:
+        if fmt_def.record_struct.size > data_length:
             return None
         
-        try:
-            struct_format = fmt_def.get_struct_format()
-            expected_size = struct.calcsize(struct_format)
-            
-            if expected_size > data_length:
-                return None
-            
-            values = struct.unpack(struct_format, data[:expected_size])
-            message = {'type': fmt_def.name}
-            
-            for i, (field_name, value) in enumerate(zip(fmt_def.field_names, values)):
-                if isinstance(value, bytes):
-                    value = value.rstrip(b'\x00').decode('ascii', errors='ignore')
-                
-                format_char = fmt_def.format_chars[i] if i < len(fmt_def.format_chars) else ''
-                if format_char in ['c', 'C', 'e', 'E']:
-                    value = value / 100.0
-                elif format_char == 'L':
-                    value = value / 1e7
-                
-                message[field_name] = value
-            
-            return message
-            
-        except struct.error:
-            return None
+        self._offsets[msg_type].append(pos)
+        return pos + data_length
+    
+    def _decode_messages(self, buf: np.ndarray, fmt_def: FormatDefinition, offsets: List[int]) -> np.ndarray:
+        """Gather all payloads of one format into a structured array and apply scaling"""
+        dtype = fmt_def.dtype
+        count = len(offsets)
+        
+        records = np.empty(count, dtype=dtype)
+        if dtype.itemsize:
+            rows = records.view(np.uint8).reshape(count, dtype.itemsize)
+            columns = np.arange(dtype.itemsize)
+            starts = np.asarray(offsets, dtype=np.int64)
+            step = max(1, self.GATHER_CHUNK // dtype.itemsize)
+            for i in range(0, count, step):
+                rows[i:i + step] = buf[starts[i:i + step, None] + columns]
+        
+        if fmt_def.output_dtype == dtype:
+            return records
+        
+        messages = np.empty(count, dtype=fmt_def.output_dtype)
+        for name, scale in fmt_def.columns:
+            if scale is None:
+                messages[name] = records[name]
+            else:
+                messages[name] = records[name] / scale
+        
+        return messages
     
     def _process_fmt_message(self, msg: Dict[str, Any]) -> None:
         fmt_def = FormatDefinition(
@@ -179,37 +359,78 @@ class ArduPilotBinParser:
             format_chars=msg['format'],
             field_names=msg['columns']
         )
+        
+        previous = self.formats.get(msg['msg_type'])
+        if previous == fmt_def:
+            return
+        
+        # A redefinition only applies to messages that follow it
+        if previous is not None and msg['msg_type'] in self._offsets:
+            self._batches.append((previous, self._offsets.pop(msg['msg_type'])))
+        
         self.formats[msg['msg_type']] = fmt_def
+        
+        data_length = fmt_def.msg_length - 3
+        indexable = (
+            msg['msg_type'] not in (MessageType.FMT, MessageType.MSG, ord('Y'))
+            and 0 < fmt_def.record_struct.size <= data_length
+        )
+        self._data_lengths[msg['msg_type']] = data_length if indexable else 0
+    
+    def _process_data_messages(self, fmt_def: FormatDefinition, messages: np.ndarray) -> None:
+        if fmt_def.name == 'PARM':
+            self._process_parm_messages(messages)
+        elif fmt_def.name == 'MSG':
+            if 'Message' in messages.dtype.names:
+                for message in messages['Message']:
+                    self._process_text_message({'Message': message.decode('ascii', errors='ignore')})
+        elif fmt_def.name in ['UNIT', 'MULT', 'FMTU'] or not fmt_def.columns:
+            return
+        elif fmt_def.name in self.messages_by_type:
+            existing = self.messages_by_type[fmt_def.name]
+            if existing.dtype == messages.dtype:
+                combined = np.concatenate([existing, messages])
+            else:
+                combined = merge_records(existing, messages)
+            # Batches from different FMT ids sharing a name are decoded one
+            # after the other, so their rows interleave in time
+            self.messages_by_type[fmt_def.name] = sort_by_time(combined)
+        else:
+            self.messages_by_type[fmt_def.name] = messages
     
-    def _process_parm_message(self, msg: Dict[str, Any]) -> None:
-        if 'Name' in msg and 'Value' in msg:
-            self.parameters[msg['Name']] = msg['Value']
+    def _process_parm_messages(self, messages: np.ndarray) -> None:
+        if 'Name' in messages.dtype.names and 'Value' in messages.dtype.names:
+            for name, value in zip(messages['Name'].tolist(), messages['Value'].tolist()):
+                if isinstance(name, bytes):
+                    name = decode_name(name)
+                self.parameters[name] = value
     
     def _process_text_message(self, msg: Dict[str, Any]) -> None:
         if 'Message' in msg:
             message = msg['Message']
             self.text_messages.append(message)
             
-            if any(x in message for x in ['ArduPlane', 'ArduCopter', 'ArduRover', 'ArduSub']):
+            if 'sw_version' not in self.version_info and self.VEHICLE_RE.search(message):
                 self.version_info['sw_version'] = message
     
-    def get_messages_by_type(self, msg_type: str) -> List[Dict[str, Any]]:
-        return self.messages_by_type.get(msg_type, [])
+    def get_messages_by_type(self, msg_type: str) -> Optional[np.ndarray]:
+        return self.messages_by_type.get(msg_type)
     
     def get_available_message_types(self) -> List[str]:
         return sorted(list(self.messages_by_type.keys()))
     
     def get_timeline_range(self) -> tuple:
-        min_timestamp = None
-        max_timestamp = None
-        
-        for msg_list in self.messages_by_type.values():
-            for msg in msg_list:
-                if 'TimeUS' in msg:
-                    ts = msg['TimeUS']
-                    if min_timestamp is None or ts < min_timestamp:
-                        min_timestamp = ts
-                    if max_timestamp is None or ts > max_timestamp:
-                        max_timestamp = ts
-        
-        return min_timestamp, max_timestamp
+        # Each topic is kept in TimeUS order (see _process_data_messages),
+        # so its range is just its first and last TimeUS.
+        mins = []
+        maxs = []
+        
+        for messages in self.messages_by_type.values():
+            if 'TimeUS' in messages.dtype.names and len(messages):
+                mins.append(int(messages['TimeUS'][0]))
+                maxs.append(int(messages['TimeUS'][-1]))
+        
+        if not mins:
+            return None, None
+        
+        return min(mins), max(maxs)
@@ -1,14 +1,26 @@
 import json
 import socket
 import struct
-from typing import List, Dict, Any
-from collections import defaultdict
 
+import numpy as np
 import pyarrow as pa
-import pyarrow.ipc as ipc
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from parsers.ardupilot import ArduPilotBinParser
+from senders.ipc_stream import configure_socket, socket_stream, write_table
+
+
+def string_array(column: np.ndarray):
+    # Log strings (event ids, mode names, ...) are mostly repeats; when
+    # there are few distinct values the column is sent dictionary-encoded
+    # and only the distinct values are decoded
+    values, codes = np.unique(column, return_inverse=True)
+    values = np.char.decode(values, 'ascii', errors='ignore')
+    
+    if len(values) > 0.1 * len(column):
+        return pa.array(values[codes])
+    
+    return pa.DictionaryArray.from_arrays(pa.array(codes.astype(np.int32)), pa.array(values))
 
 
 class ArduPilotSender(QObject):
@@ -21,36 +33,27 @@ class ArduPilotSender(QObject):
         self.host = host
         self.port = port
     
-    def messages_to_arrow_table(self, msg_type: str, messages: List[Dict[str, Any]]):
-        if not messages:
+    def messages_to_arrow_table(self, msg_type: str, messages: np.ndarray):
+        if messages is None or len(messages) == 0:
             return None
         
-        data = defaultdict(list)
-        
-        for msg in messages:
-            for key, value in msg.items():
-                if key == 'type':
-                    continue
-                data[key].append(value)
-        
         arrays = []
         names = []
         
-        if 'TimeUS' in data:
-            arrays.append(pa.array(data['TimeUS'], type=pa.int64()))
+        if 'TimeUS' in messages.dtype.names:
+            arrays.append(pa.array(messages['TimeUS'].astype(np.int64)))
             names.append('timestamp')
         
-        for field_name, values in data.items():
+        for field_name in messages.dtype.names:
             if field_name == 'TimeUS':
                 continue
-                
-            try:
-                arrays.append(pa.array(values))
-                names.append(field_name)
-            except (pa.ArrowInvalid, pa.ArrowTypeError):
-                string_values = [str(v) if v is not None else "" for v in values]
-                arrays.append(pa.array(string_values, type=pa.string()))
-                names.append(field_name)
+            
+            column = messages[field_name]
+            if column.dtype.kind == 'S':
+                arrays.append(string_array(column))
+            else:
+                arrays.append(pa.array(np.ascontiguousarray(column)))
+            names.append(field_name)
         
         if not arrays:
             return None
@@ -70,7 +73,7 @@ class ArduPilotSender(QObject):
             tables = {}
             for msg_type in parser.get_available_message_types():
                 messages = parser.get_messages_by_type(msg_type)
-                if messages:
+                if messages is not None and len(messages):
                     table = self.messages_to_arrow_table(msg_type, messages)
                     if table is not None:
                         tables[msg_type.lower()] = table
@@ -81,6 +84,7 @@ class ArduPilotSender(QObject):
             
             self.log_signal.emit(f"\nConnecting to {self.host}:{self.port}...")
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            configure_socket(sock)
             sock.connect((self.host, self.port))
             self.log_signal.emit("✓ Connected successfully!")
             
@@ -109,22 +113,13 @@ class ArduPilotSender(QObject):
                 
                 metadata_json = json.dumps(metadata).encode('utf-8')
                 metadata_len = struct.pack('<I', len(metadata_json))
-                sock.sendall(metadata_len + metadata_json)
+                out = socket_stream(sock)
+                out.write(metadata_len + metadata_json)
                 self.log_signal.emit(f"\nSent metadata ({len(metadata_json)} bytes)")
                 
                 for table_name, table in tables.items():
-                    name_bytes = table_name.encode('utf-8')
-                    name_len = struct.pack('<I', len(name_bytes))
-                    sock.sendall(name_len + name_bytes)
-                    
-                    sink = pa.BufferOutputStream()
-                    with ipc.new_stream(sink, table.schema) as writer:
-                        writer.write_table(table)
-                    
-                    arrow_buffer = sink.getvalue()
-                    table_size = struct.pack('<Q', len(arrow_buffer))
-                    sock.sendall(table_size)
-                    sock.sendall(arrow_buffer)
+                    write_table(out, table_name, table)
+                out.flush()
                 
                 self.log_signal.emit("\n✓ All data sent successfully!")
                 self.finished_signal.emit(True, "Success")
@@ -0,0 +1,169 @@
+import os
+import socket
+import struct
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+# Receiver framing: u32 metadata length and JSON, then per table a u32 name
+# length, the name, a u64 stream length and a complete Arrow IPC stream.
+# Uncompressed streams are sized with a mock stream and written through;
+# compressed ones are only sized after compressing, so they are spooled
+# first (to a memfd sent with sendfile when the socket is known).
+# TopicStreams frames batches around a cached schema message and does not
+# emit dictionary batches, so its tables must not use dictionary columns.
+
+SEND_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Writes below this size are gathered before they reach the socket
+COALESCE_THRESHOLD = 1 << 16
+
+# Conservative bound on iovecs per sendmsg call (IOV_MAX is 1024 on Linux)
+MAX_IOVECS = 512
+
+
+def configure_socket(sock):
+    """Disable Nagle so framing headers are not held back, and widen the send buffer"""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+
+
+def coalesce_buffers(buffers, threshold=COALESCE_THRESHOLD):
+    """Merge runs of small buffers into one bytes-like chunk; large ones pass through"""
+    chunks = []
+    pending = bytearray()
+    for buffer in buffers:
+        view = memoryview(buffer).cast('B')
+        if view.nbytes < threshold:
+            pending += view
+            continue
+        
+        if pending:
+            chunks.append(pending)
+            pending = bytearray()
+        chunks.append(view)
+    
+    if pending:
+        chunks.append(pending)
+    return chunks
+
+
+def send_buffers(sock, buffers):
+    """Send several buffers back to back, gathered into as few syscalls as possible"""
+    views = [memoryview(chunk) for chunk in coalesce_buffers(buffers)]
+    
+    if not hasattr(sock, 'sendmsg'):
+        for view in views:
+            sock.sendall(view)
+        return
+    
+    first = 0
+    while first < len(views):
+        sent = sock.sendmsg(views[first:first + MAX_IOVECS])
+        while sent:
+            remaining = views[first].nbytes
+            if sent >= remaining:
+                sent -= remaining
+                first += 1
+            else:
+                views[first] = views[first][sent:]
+                sent = 0
+
+
+class SocketSink:
+    """File-like wrapper so Arrow can write IPC data straight into a socket"""
+    
+    def __init__(self, sock):
+        self.sock = sock
+        self.closed = False
+    
+    def write(self, data):
+        self.sock.sendall(data)
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+
+
+def ipc_stream_size(table) -> int:
+    sizer = pa.MockOutputStream()
+    with ipc.new_stream(sizer, table.schema) as writer:
+        writer.write_table(table)
+    return sizer.size()
+
+
+def socket_stream(sock, buffer_size=COALESCE_THRESHOLD):
+    """Buffered Arrow output stream over a socket; call flush() once everything is written"""
+    return pa.BufferedOutputStream(pa.PythonFile(SocketSink(sock), mode='w'), buffer_size=buffer_size)
+
+
+def compression_options(codec):
+    """IPC write options compressing record batch bodies, or None if the codec is unavailable"""
+    if codec is None or not pa.Codec.is_available(codec):
+        return None
+    return ipc.IpcWriteOptions(compression=codec)
+
+
+def write_table(out, table_name, table, options=None, sock=None):
+    """Write one named table and its IPC stream to out using the receiver's framing"""
+    name_bytes = table_name.encode('utf-8')
+    
+    if options is not None and options.compression is not None:
+        if sock is not None and hasattr(os, 'memfd_create'):
+            with open(os.memfd_create('ipc-stream'), 'w+b') as spool:
+                with ipc.new_stream(pa.PythonFile(spool, mode='w'), table.schema, options=options) as writer:
+                    writer.write_table(table)
+                spool.flush()
+                stream_size = spool.tell()
+                
+                out.write(struct.pack('<I', len(name_bytes)) + name_bytes + struct.pack('<Q', stream_size))
+                out.flush()
+                sock.sendfile(spool, 0, stream_size)
+            return
+        
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        stream = sink.getvalue()
+        
+        out.write(struct.pack('<I', len(name_bytes)) + name_bytes + struct.pack('<Q', stream.size))
+        out.write(stream)
+        return
+    
+    prelude = struct.pack('<I', len(name_bytes)) + name_bytes + struct.pack('<Q', ipc_stream_size(table))
+    
+    out.write(prelude)
+    with ipc.new_stream(out, table.schema) as writer:
+        writer.write_table(table)
+
+
+class TopicStreams:
+    """Framing for repeatedly sent topics, reusing each topic's schema message while its schema holds"""
+    
+    EOS = b'\xff\xff\xff\xff\x00\x00\x00\x00'
+    
+    def __init__(self):
+        self.schemas = {}
+    
+    def schema_message(self, table_name, schema):
+        cached = self.schemas.get(table_name)
+        if cached is None or not cached[0].equals(schema):
+            cached = (schema, schema.serialize())
+            self.schemas[table_name] = cached
+        return cached[1]
+    
+    def table_buffers(self, table_name, table):
+        """Framing and IPC stream for one table or record batch, as a list of buffers to send"""
+        schema_message = self.schema_message(table_name, table.schema)
+        batches = [table] if isinstance(table, pa.RecordBatch) else table.to_batches()
+        batch_messages = [batch.serialize() for batch in batches]
+        
+        name_bytes = table_name.encode('utf-8')
+        stream_size = schema_message.size + sum(m.size for m in batch_messages) + len(self.EOS)
+        prelude = struct.pack('<I', len(name_bytes)) + name_bytes + struct.pack('<Q', stream_size)
+        
+        return [prelude, schema_message, *batch_messages, self.EOS]
@@ -3,18 +3,103 @@ import socket
 import struct
 import time
 import threading
-from collections import defaultdict, deque
 
+import numpy as np
 import pyarrow as pa
-import pyarrow.ipc as ipc
 from pymavlink import mavutil
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from senders.ipc_stream import TopicStreams, configure_socket, send_buffers
+
+# Metadata is re-encoded on every update; orjson is used when it is installed
+try:
+    from orjson import dumps as dumps_json
+except ImportError:
+    def dumps_json(obj):
+        return json.dumps(obj).encode('utf-8')
+
+
+class TopicBuffer:
+    """Ring buffer of the most recent messages of one type, kept column-wise.
+    
+    Columns are allocated from the first message: float and int fields get
+    numpy arrays, short numeric arrays (e.g. battery cell voltages) a 2D
+    array with one column per element, anything else (strings, bytes, long
+    arrays) an object array.
+    """
+    
+    MAX_EXPANDED_LENGTH = 32
+    
+    def __init__(self, msg, capacity):
+        self.capacity = capacity
+        self.fieldnames = tuple(msg.get_fieldnames())
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.columns = {}
+        self.arrays = {}
+        self.element_names = {}
+        for field in self.fieldnames:
+            value = getattr(msg, field, None)
+            if isinstance(value, float):
+                self.columns[field] = np.zeros(capacity, dtype=np.float64)
+            elif isinstance(value, int):
+                self.columns[field] = np.zeros(capacity, dtype=np.int64)
+            elif self.is_expandable(value):
+                dtype = np.float64 if any(isinstance(v, float) for v in value) else np.int64
+                self.arrays[field] = np.zeros((capacity, len(value)), dtype=dtype)
+                self.element_names[field] = [f"{field}[{index}]" for index in range(len(value))]
+            else:
+                self.columns[field] = np.empty(capacity, dtype=object)
+        self.cursor = 0
+        self.count = 0
+    
+    def is_expandable(self, value):
+        return (
+            isinstance(value, (list, tuple))
+            and 0 < len(value) <= self.MAX_EXPANDED_LENGTH
+            and all(isinstance(v, (int, float)) for v in value)
+        )
+    
+    def append(self, timestamp, msg):
+        i = self.cursor
+        self.timestamps[i] = timestamp
+        for field, column in self.columns.items():
+            value = getattr(msg, field, None)
+            try:
+                column[i] = value
+            except (TypeError, ValueError, OverflowError):
+                column = self.columns[field] = column.astype(object)
+                column[i] = value
+        
+        for field, block in self.arrays.items():
+            value = getattr(msg, field, None)
+            row = block[i]
+            try:
+                row[:] = value
+            except (TypeError, ValueError, OverflowError):
+                row[:] = 0
+                if isinstance(value, (list, tuple)):
+                    row[:len(value)] = value[:len(row)]
+        
+        self.cursor = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def select(self, start_time_us, end_time_us):
+        """Slot indices of the messages in [start, end], oldest first"""
+        if self.count < self.capacity:
+            slots = np.arange(self.count)
+        else:
+            slots = (np.arange(self.capacity) + self.cursor) % self.capacity
+        
+        timestamps = self.timestamps[slots]
+        return slots[(timestamps >= start_time_us) & (timestamps <= end_time_us)]
+
 
 class MAVLinkStreamer(QObject):
     log_signal = pyqtSignal(str)
     status_signal = pyqtSignal(str)
     
+    BUFFER_SIZE = 1000
+    
     def __init__(self, connection_string, baudrate, host, port, update_rate_hz):
         super().__init__()
         self.connection_string = connection_string
@@ -24,7 +109,9 @@ class MAVLinkStreamer(QObject):
         self.update_rate_hz = update_rate_hz
         self.update_interval = 1.0 / update_rate_hz
         
-        self.start_time_us = int(time.time() * 1_000_000)
+        # Timestamps come from the monotonic clock, anchored to wall time once
+        self.epoch_offset_us = time.time_ns() // 1000 - time.monotonic_ns() // 1000
+        self.start_time_us = self.get_current_time_us()
         self.last_sent_time_us = self.start_time_us
         
         self.sock = None
@@ -32,11 +119,11 @@ class MAVLinkStreamer(QObject):
         self.running = False
         
         self.buffer_lock = threading.Lock()
-        self.data_buffers = defaultdict(lambda: deque(maxlen=1000))
+        self.data_buffers = {}
         
         self.parameters = {
             "mavlink_connection": connection_string,
-            "buffer_size": 1000,
+            "buffer_size": self.BUFFER_SIZE,
             "update_rate_hz": update_rate_hz
         }
         
@@ -44,12 +131,13 @@ class MAVLinkStreamer(QObject):
         
         self.mavlink_thread = None
         self.seen_message_types = set()
+        self.topic_streams = TopicStreams()
         
         self.total_messages_sent = 0
         self.total_tables_sent = 0
     
     def get_current_time_us(self):
-        return int(time.time() * 1_000_000)
+        return time.monotonic_ns() // 1000 + self.epoch_offset_us
     
     def connect_mavlink(self):
         try:
@@ -80,13 +168,12 @@ class MAVLinkStreamer(QObject):
                 current_time_us = self.get_current_time_us()
                 
                 with self.buffer_lock:
-                    self.data_buffers[msg_type].append({
-                        'timestamp': current_time_us,
-                        'msg': msg
-                    })
-                    
-                    if msg_type not in self.seen_message_types:
+                    buffer = self.data_buffers.get(msg_type)
+                    if buffer is None:
+                        buffer = self.data_buffers[msg_type] = TopicBuffer(msg, self.BUFFER_SIZE)
                         self.seen_message_types.add(msg_type)
+                    
+                    buffer.append(current_time_us, msg)
                         
             except Exception as e:
                 if self.running:
@@ -101,36 +188,30 @@ class MAVLinkStreamer(QObject):
             return 0
         return value
     
-    def create_table_from_messages(self, msg_type, messages):
-        if not messages:
+    def create_table_from_buffer(self, buffer, slots):
+        if len(slots) == 0:
             return None
         
-        first_msg = messages[0]['msg']
-        fieldnames = first_msg.get_fieldnames()
-        
-        data = defaultdict(list)
-        data['timestamp'] = []
-        
-        for item in messages:
-            msg = item['msg']
-            relative_timestamp = item['timestamp'] - self.start_time_us
-            data['timestamp'].append(relative_timestamp)
-            
-            for field in fieldnames:
-                try:
-                    value = getattr(msg, field)
-                    data[field].append(value)
-                except AttributeError:
-                    data[field].append(None)
-        
         arrays = []
         names = []
         
-        arrays.append(pa.array(data['timestamp'], type=pa.int64()))
+        arrays.append(pa.array(buffer.timestamps[slots] - self.start_time_us))
         names.append('timestamp')
         
-        for field in fieldnames:
-            values = data[field]
+        for field in buffer.fieldnames:
+            if field in buffer.arrays:
+                elements = buffer.arrays[field][slots].T.copy()
+                arrays.extend(pa.array(element) for element in elements)
+                names.extend(buffer.element_names[field])
+                continue
+            
+            column = buffer.columns[field][slots]
+            if column.dtype != object:
+                arrays.append(pa.array(column))
+                names.append(field)
+                continue
+            
+            values = column.tolist()
             
             if not values or all(v is None for v in values):
                 continue
@@ -169,19 +250,12 @@ class MAVLinkStreamer(QObject):
         
         with self.buffer_lock:
             for msg_type, buffer in self.data_buffers.items():
-                if not buffer:
-                    continue
-                
-                messages = [
-                    item for item in buffer
-                    if start_time_us <= item['timestamp'] <= end_time_us
-                ]
-                
-                if not messages:
+                slots = buffer.select(start_time_us, end_time_us)
+                if len(slots) == 0:
                     continue
                 
                 try:
-                    table = self.create_table_from_messages(msg_type, messages)
+                    table = self.create_table_from_buffer(buffer, slots)
                     if table is not None:
                         table_name = msg_type.lower()
                         tables[table_name] = table
@@ -206,18 +280,21 @@ class MAVLinkStreamer(QObject):
             self.last_sent_time_us = current_time_us
             return
         
-        all_timestamps = []
+        # Buffers are filled in arrival order, so every timestamp column is sorted
+        mins = []
+        maxs = []
         for table in tables.values():
-            ts_array = table.column('timestamp').to_numpy()
-            all_timestamps.extend(ts_array)
+            timestamps = table.column('timestamp')
+            if len(timestamps):
+                mins.append(timestamps[0].as_py())
+                maxs.append(timestamps[-1].as_py())
         
-        if not all_timestamps:
+        if not mins:
             self.last_sent_time_us = current_time_us
             return
         
-        import numpy as np
-        min_ts = int(np.min(all_timestamps))
-        max_ts = int(np.max(all_timestamps))
+        min_ts = min(mins)
+        max_ts = max(maxs)
         
         if min_ts < 0:
             min_ts = 0
@@ -233,27 +310,17 @@ class MAVLinkStreamer(QObject):
             }
         }
         
-        metadata_json = json.dumps(metadata).encode('utf-8')
+        metadata_json = dumps_json(metadata)
         metadata_len = struct.pack('<I', len(metadata_json))
-        self.sock.sendall(metadata_len + metadata_json)
+        buffers = [metadata_len, metadata_json]
         
         total_rows = 0
         for table_name, table in tables.items():
-            name_bytes = table_name.encode('utf-8')
-            name_len = struct.pack('<I', len(name_bytes))
-            self.sock.sendall(name_len + name_bytes)
-            
-            sink = pa.BufferOutputStream()
-            with ipc.new_stream(sink, table.schema) as writer:
-                writer.write_table(table)
-            arrow_buffer = sink.getvalue()
-            
-            table_size = struct.pack('<Q', len(arrow_buffer))
-            self.sock.sendall(table_size)
-            self.sock.sendall(arrow_buffer)
-            
+            buffers.extend(self.topic_streams.table_buffers(table_name, table))
             total_rows += table.num_rows
         
+        send_buffers(self.sock, buffers)
+        
         self.last_sent_time_us = current_time_us
         self.total_messages_sent += total_rows
         self.total_tables_sent += len(tables)
@@ -270,6 +337,7 @@ class MAVLinkStreamer(QObject):
         for attempt in range(max_retries):
             try:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                configure_socket(self.sock)
                 self.sock.connect((self.host, self.port))
                 return True
             except (ConnectionRefusedError, OSError):
@@ -313,9 +381,8 @@ class MAVLinkStreamer(QObject):
             consecutive_errors = 0
             max_consecutive_errors = 3
             
+            next_deadline = time.monotonic()
             while self.running:
-                loop_start = time.time()
-                
                 try:
                     self.send_update()
                     consecutive_errors = 0
@@ -335,9 +402,13 @@ class MAVLinkStreamer(QObject):
                     consecutive_errors = 0
                     continue
                 
-                elapsed = time.time() - loop_start
-                sleep_time = max(0, self.update_interval - elapsed)
-                time.sleep(sleep_time)
+                # Fixed-rate schedule; after a stall, resume from now rather than
+                # sending a burst of catch-up updates
+                next_deadline += self.update_interval
+                now = time.monotonic()
+                if next_deadline < now:
+                    next_deadline = now
+                time.sleep(next_deadline - now)
             
             self.log_signal.emit(f"\n✓ Total messages sent: {self.total_messages_sent:,}")
             
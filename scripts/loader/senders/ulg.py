@@ -3,20 +3,28 @@ import socket
 import struct
 
 import pyarrow as pa
-import pyarrow.ipc as ipc
+import pyarrow.compute as pc
 from pyulog import ULog
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from senders.ipc_stream import compression_options, configure_socket, socket_stream, write_table
+
 
 class ULGSender(QObject):
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
     
-    def __init__(self, filename, host, port):
+    # Codec used when compression is requested; ULog signals are slow-moving
+    # and compress well, which pays off on slow links but only costs CPU on
+    # loopback, and the viewer must be built with arrow's ipc_compression
+    LZ4 = 'lz4_frame'
+    
+    def __init__(self, filename, host, port, compression=None):
         super().__init__()
         self.filename = filename
         self.host = host
         self.port = port
+        self.compression = compression
     
     def parse_ulg_file(self):
         ulg = ULog(self.filename)
@@ -28,15 +36,9 @@ class ULGSender(QObject):
             else:
                 name = data.name
             
-            arrays = []
-            field_names = []
-            
-            for field_name, field_data in data.data.items():
-                arrays.append(pa.array(field_data))
-                field_names.append(field_name)
-            
-            table = pa.Table.from_arrays(arrays, names=field_names)
-            tables[name] = table
+            # Fields are strided views into pyulog's packed record buffer;
+            # Arrow gathers each one into its own column in a single pass
+            tables[name] = pa.table(data.data)
         
         parameters = ulg.initial_parameters
         version_info = ulg.msg_info_dict
@@ -54,26 +56,28 @@ class ULGSender(QObject):
             
             self.log_signal.emit(f"\nConnecting to {self.host}:{self.port}...")
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            configure_socket(sock)
             sock.connect((self.host, self.port))
             self.log_signal.emit("✓ Connected successfully!")
             
             try:
+                options = compression_options(self.compression)
                 min_timestamp = None
                 max_timestamp = None
                 
                 for table_name, table in tables.items():
                     if 'timestamp' in table.column_names:
-                        timestamps = table.column('timestamp').to_pylist()
-                        if timestamps:
-                            valid_timestamps = [ts for ts in timestamps if ts != 0]
-                            if valid_timestamps:
-                                table_min = min(valid_timestamps)
-                                table_max = max(valid_timestamps)
-                                
-                                if min_timestamp is None or table_min < min_timestamp:
-                                    min_timestamp = table_min
-                                if max_timestamp is None or table_max > max_timestamp:
-                                    max_timestamp = table_max
+                        timestamps = table.column('timestamp')
+                        valid_timestamps = timestamps.filter(pc.not_equal(timestamps, 0))
+                        if len(valid_timestamps):
+                            table_range = pc.min_max(valid_timestamps)
+                            table_min = table_range['min'].as_py()
+                            table_max = table_range['max'].as_py()
+                            
+                            if min_timestamp is None or table_min < min_timestamp:
+                                min_timestamp = table_min
+                            if max_timestamp is None or table_max > max_timestamp:
+                                max_timestamp = table_max
                 
                 metadata = {
                     'parameters': {k: float(v) if isinstance(v, (int, float)) else str(v) 
@@ -84,7 +88,8 @@ class ULGSender(QObject):
                     'timeline_range': {
                         'min_timestamp': int(min_timestamp) if min_timestamp is not None else None,
                         'max_timestamp': int(max_timestamp) if max_timestamp is not None else None
-                    }
+                    },
+                    'compression': self.compression if options is not None else None
                 }
                 
                 if min_timestamp is not None and max_timestamp is not None:
@@ -97,22 +102,13 @@ class ULGSender(QObject):
                 
                 metadata_json = json.dumps(metadata).encode('utf-8')
                 metadata_len = struct.pack('<I', len(metadata_json))
-                sock.sendall(metadata_len + metadata_json)
+                out = socket_stream(sock)
+                out.write(metadata_len + metadata_json)
                 self.log_signal.emit(f"\nSent metadata ({len(metadata_json)} bytes)")
                 
                 for table_name, table in tables.items():
-                    name_bytes = table_name.encode('utf-8')
-                    name_len = struct.pack('<I', len(name_bytes))
-                    sock.sendall(name_len + name_bytes)
-                    
-                    sink = pa.BufferOutputStream()
-                    with ipc.new_stream(sink, table.schema) as writer:
-                        writer.write_table(table)
-                    
-                    arrow_buffer = sink.getvalue()
-                    table_size = struct.pack('<Q', len(arrow_buffer))
-                    sock.sendall(table_size)
-                    sock.sendall(arrow_buffer)
+                    write_table(out, table_name, table, options, sock)
+                out.flush()
                 
                 self.log_signal.emit("\n✓ All data sent successfully!")
                 self.finished_signal.emit(True, "Success")
@@ -0,0 +1,136 @@
+import struct
+
+import numpy as np
+import pytest
+
+from parsers.ardupilot import FORMAT_MAP, ArduPilotBinParser
+
+
+HEADER = b'\xa3\x95'
+
+
+def fmt_message(msg_type, name, format_chars, columns):
+    length = 3 + struct.calcsize('<' + ''.join(FORMAT_MAP[char] for char in format_chars))
+    return HEADER + b'\x80' + struct.pack(
+        '<BB4s16s64s', msg_type, length, name.encode(), format_chars.encode(), columns.encode()
+    )
+
+
+def data_message(msg_type, layout, *values):
+    return HEADER + bytes([msg_type]) + struct.pack(layout, *values)
+
+
+def write_log(path, *messages):
+    path.write_bytes(fmt_message(0x80, 'FMT', 'BBnNZ', 'Type,Length,Name,Format,Columns') + b''.join(messages))
+    return str(path)
+
+
+def test_redefinition_with_new_layout_keeps_all_messages(tmp_path):
+    filepath = write_log(
+        tmp_path / 'redefined.bin',
+        fmt_message(20, 'ATT', 'QfB', 'TimeUS,Roll,Mode'),
+        data_message(20, '<QfB', 1000, 0.5, 3),
+        data_message(20, '<QfB', 2000, 0.25, 4),
+        fmt_message(20, 'ATT', 'Qff', 'TimeUS,Roll,Pitch'),
+        data_message(20, '<Qff', 3000, 0.125, -1.0),
+    )
+    
+    parser = ArduPilotBinParser(filepath)
+    parser.parse()
+    messages = parser.get_messages_by_type('ATT')
+    
+    assert len(messages) == 3
+    assert messages['TimeUS'].tolist() == [1000, 2000, 3000]
+    assert messages['Roll'].tolist() == [0.5, 0.25, 0.125]
+    np.testing.assert_array_equal(messages['Mode'], [3, 4, np.nan])
+    np.testing.assert_array_equal(messages['Pitch'], [np.nan, np.nan, -1.0])
+    assert parser.get_timeline_range() == (1000, 3000)
+
+
+def test_redefinition_with_same_layout_concatenates(tmp_path):
+    filepath = write_log(
+        tmp_path / 'repeated.bin',
+        fmt_message(21, 'EV', 'Qn', 'TimeUS,Id'),
+        data_message(21, '<Q4s', 1000, b'A'),
+        fmt_message(22, 'EV', 'Qn', 'TimeUS,Id'),
+        data_message(22, '<Q4s', 2000, b'B'),
+    )
+    
+    parser = ArduPilotBinParser(filepath)
+    parser.parse()
+    messages = parser.get_messages_by_type('EV')
+    
+    assert messages.dtype.names == ('TimeUS', 'Id')
+    assert messages['Id'].tolist() == [b'A', b'B']
+
+
+def test_decode_error_is_not_masked_by_mmap_close(tmp_path, monkeypatch):
+    filepath = write_log(
+        tmp_path / 'failing.bin',
+        fmt_message(20, 'ATT', 'Qf', 'TimeUS,Roll'),
+        data_message(20, '<Qf', 1000, 0.5),
+    )
+    
+    # The failing frame's buf argument is a view of the map, and the
+    # traceback keeps it alive while the exception propagates
+    def failing_decode(self, buf, fmt_def, offsets):
+        raise ValueError('decode failed')
+    
+    monkeypatch.setattr(ArduPilotBinParser, '_decode_messages', failing_decode)
+    
+    with pytest.raises(ValueError, match='decode failed'):
+        ArduPilotBinParser(filepath).parse()
+
+
+@pytest.mark.parametrize('contents', [b'', None])
+def test_scan_index_is_empty_after_parse(tmp_path, contents):
+    path = tmp_path / 'log.bin'
+    if contents is None:
+        filepath = write_log(path, fmt_message(20, 'ATT', 'Qf', 'TimeUS,Roll'), data_message(20, '<Qf', 1000, 0.5))
+    else:
+        path.write_bytes(contents)
+        filepath = str(path)
+    
+    parser = ArduPilotBinParser(filepath)
+    parser.parse()
+    
+    assert not parser._offsets
+    assert not parser._batches
+    assert not any(parser._data_lengths)
+
+
+def test_batches_from_several_formats_are_time_ordered(tmp_path):
+    filepath = write_log(
+        tmp_path / 'interleaved.bin',
+        fmt_message(20, 'BAT', 'Qf', 'TimeUS,Volt'),
+        fmt_message(21, 'BAT', 'Qf', 'TimeUS,Volt'),
+        data_message(20, '<Qf', 1000, 12.0),
+        data_message(21, '<Qf', 2000, 11.5),
+        data_message(20, '<Qf', 3000, 11.0),
+        data_message(21, '<Qf', 500, 12.5),
+    )
+    
+    parser = ArduPilotBinParser(filepath)
+    parser.parse()
+    messages = parser.get_messages_by_type('BAT')
+    
+    assert messages['TimeUS'].tolist() == [500, 1000, 2000, 3000]
+    assert messages['Volt'].tolist() == [12.5, 12.0, 11.5, 11.0]
+    assert parser.get_timeline_range() == (500, 3000)
+
+
+def test_string_and_number_fields_of_one_name_stay_separate(tmp_path):
+    filepath = write_log(
+        tmp_path / 'conflict.bin',
+        fmt_message(20, 'EV', 'Qn', 'TimeUS,Id'),
+        data_message(20, '<Q4s', 1000, b'ARM'),
+        fmt_message(20, 'EV', 'QB', 'TimeUS,Id'),
+        data_message(20, '<QB', 2000, 7),
+    )
+    
+    parser = ArduPilotBinParser(filepath)
+    parser.parse()
+    messages = parser.get_messages_by_type('EV')
+    
+    assert messages['Id_str'].tolist() == [b'ARM', b'']
+    np.testing.assert_array_equal(messages['Id'], [np.nan, 7])
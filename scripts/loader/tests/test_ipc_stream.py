@@ -0,0 +1,106 @@
+import itertools
+import struct
+
+import pyarrow as pa
+import pytest
+
+import senders.ipc_stream as ipc_stream
+from senders.ipc_stream import COALESCE_THRESHOLD, TopicStreams, send_buffers
+
+
+class ShortWriteSocket:
+    """Socket stand-in whose sendmsg accepts only part of what it is given"""
+    
+    def __init__(self, limits):
+        self.limits = itertools.cycle(limits)
+        self.received = bytearray()
+        self.iovec_counts = []
+    
+    def sendmsg(self, buffers):
+        self.iovec_counts.append(len(buffers))
+        limit = next(self.limits)
+        accepted = 0
+        for buffer in buffers:
+            chunk = memoryview(buffer)[:limit - accepted]
+            self.received += chunk
+            accepted += chunk.nbytes
+            if accepted == limit:
+                break
+        return accepted
+
+
+class StreamOnlySocket:
+    def __init__(self):
+        self.received = bytearray()
+    
+    def sendall(self, data):
+        self.received += data
+
+
+def sample_buffers():
+    large = [bytes([i]) * (COALESCE_THRESHOLD + 17 * i) for i in range(10)]
+    small = [b'header%d' % i for i in range(10)]
+    return [buffer for pair in zip(small, large) for buffer in pair] + [b'tail']
+
+
+@pytest.mark.parametrize('limits', [[4093, 1, 65536], [7], [COALESCE_THRESHOLD + 5], [10 ** 9]])
+def test_short_sendmsg_counts_resume_where_they_stopped(monkeypatch, limits):
+    monkeypatch.setattr(ipc_stream, 'MAX_IOVECS', 4)
+    buffers = sample_buffers()
+    sock = ShortWriteSocket(limits)
+    
+    send_buffers(sock, buffers)
+    
+    assert bytes(sock.received) == b''.join(buffers)
+    assert max(sock.iovec_counts) <= 4
+
+
+def test_sockets_without_sendmsg_get_every_byte():
+    buffers = sample_buffers()
+    sock = StreamOnlySocket()
+    
+    send_buffers(sock, buffers)
+    
+    assert bytes(sock.received) == b''.join(buffers)
+
+
+def read_framed_table(data):
+    """Name and table of one framed IPC stream, checking the declared stream size"""
+    (name_len,) = struct.unpack_from('<I', data, 0)
+    name = data[4:4 + name_len].decode()
+    (stream_size,) = struct.unpack_from('<Q', data, 4 + name_len)
+    stream = data[4 + name_len + 8:]
+    assert len(stream) == stream_size
+    return name, pa.ipc.open_stream(stream).read_all()
+
+
+def frame(streams, name, table):
+    return b''.join(bytes(memoryview(buffer).cast('B')) for buffer in streams.table_buffers(name, table))
+
+
+def test_topic_streams_round_trip_across_schema_changes():
+    streams = TopicStreams()
+    first = pa.Table.from_batches([
+        pa.record_batch({'timestamp': [1, 2], 'x': [0.5, 1.5]}),
+        pa.record_batch({'timestamp': [3], 'x': [2.5]}),
+    ])
+    widened = pa.table({'timestamp': [4, 5], 'x': [1.0, 2.0], 'label': ['a', 'b']})
+    
+    name, table = read_framed_table(frame(streams, 'vehicle', first))
+    assert name == 'vehicle'
+    assert table.equals(first)
+    cached = streams.schemas['vehicle'][1]
+    
+    assert read_framed_table(frame(streams, 'vehicle', first))[1].equals(first)
+    assert streams.schemas['vehicle'][1] is cached
+    
+    assert read_framed_table(frame(streams, 'vehicle', widened))[1].equals(widened)
+    assert read_framed_table(frame(streams, 'vehicle', first))[1].equals(first)
+
+
+def test_topic_streams_frame_a_single_record_batch():
+    batch = pa.record_batch({'timestamp': [1, 2, 3]})
+    
+    _, table = read_framed_table(frame(TopicStreams(), 'ticks', batch))
+    
+    assert table.equals(pa.Table.from_batches([batch]))
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from gui.log_view import LogView
+
+
+@pytest.fixture(scope='module')
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])
+
+
+def test_lines_are_appended_together_on_flush(app):
+    view = LogView()
+    view.log('first')
+    view.log('second')
+    
+    assert view.toPlainText() == ''
+    assert view.timer.isActive()
+    
+    view.flush()
+    
+    assert view.toPlainText() == 'first\nsecond'
+    assert not view.buffer
+
+
+def test_reset_drops_pending_lines(app):
+    view = LogView()
+    view.log('old')
+    view.flush()
+    view.log('pending')
+    
+    view.reset()
+    view.flush()
+    
+    assert view.toPlainText() == ''
+    assert not view.timer.isActive()
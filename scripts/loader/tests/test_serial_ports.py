@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import gui.mavlink_tab as mavlink_tab
+from gui.mavlink_tab import get_serial_ports
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    dev = tmp_path / 'dev'
+    by_id = dev / 'serial' / 'by-id'
+    dev.mkdir()
+    monkeypatch.setattr(mavlink_tab, 'DEV_DIR', str(dev))
+    monkeypatch.setattr(mavlink_tab, 'SERIAL_BY_ID_DIR', str(by_id))
+    monkeypatch.setattr(mavlink_tab, '_PORTS_CACHE', {'mtime': None, 'dev_mtime': None, 'ports': None})
+    return dev, by_id
+
+
+def touch_dir(path, mtime_ns):
+    # Bump the mtime explicitly so the test does not depend on timestamp granularity
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def names(ports):
+    return [port['name'] for port in ports]
+
+
+def test_dev_fallback_is_cached_until_dev_changes(dirs):
+    dev, _ = dirs
+    (dev / 'ttyACM0').touch()
+    touch_dir(dev, 1_000)
+    
+    ports = get_serial_ports()
+    assert names(ports) == ['ttyACM0']
+    assert get_serial_ports() is ports
+    
+    (dev / 'ttyUSB0').touch()
+    touch_dir(dev, 2_000)
+    assert names(get_serial_ports()) == ['ttyACM0', 'ttyUSB0']
+
+
+def test_by_id_listing_is_cached_until_by_id_changes(dirs):
+    dev, by_id = dirs
+    by_id.mkdir(parents=True)
+    (dev / 'ttyACM0').touch()
+    (by_id / 'usb-Foo-if00').symlink_to('../../ttyACM0')
+    touch_dir(by_id, 1_000)
+    
+    ports = get_serial_ports()
+    assert names(ports) == ['usb-Foo-if00']
+    assert ports[0]['path'] == str(dev / 'ttyACM0')
+    
+    # /dev changing alone does not matter while by-id lists ports
+    touch_dir(dev, 5_000)
+    assert get_serial_ports() is ports
+    
+    (dev / 'ttyACM1').touch()
+    (by_id / 'usb-Bar-if00').symlink_to('../../ttyACM1')
+    touch_dir(by_id, 2_000)
+    assert names(get_serial_ports()) == ['usb-Bar-if00', 'usb-Foo-if00']
+
+
+def test_empty_by_id_falls_back_and_watches_both_directories(dirs):
+    dev, by_id = dirs
+    by_id.mkdir(parents=True)
+    (dev / 'ttyACM0').touch()
+    touch_dir(by_id, 1_000)
+    touch_dir(dev, 1_000)
+    
+    ports = get_serial_ports()
+    assert names(ports) == ['ttyACM0']
+    assert get_serial_ports() is ports
+    
+    (dev / 'ttyUSB0').touch()
+    touch_dir(dev, 2_000)
+    ports = get_serial_ports()
+    assert names(ports) == ['ttyACM0', 'ttyUSB0']
+    
+    (by_id / 'usb-Foo-if00').symlink_to('../../ttyUSB0')
+    touch_dir(by_id, 2_000)
+    assert names(get_serial_ports()) == ['usb-Foo-if00']
+
+
+def test_by_id_appearing_invalidates_the_dev_fallback(dirs):
+    dev, by_id = dirs
+    (dev / 'ttyACM0').touch()
+    touch_dir(dev, 1_000)
+    assert names(get_serial_ports()) == ['ttyACM0']
+    
+    by_id.mkdir(parents=True)
+    (by_id / 'usb-Foo-if00').symlink_to('../../ttyACM0')
+    touch_dir(by_id, 1_000)
+    touch_dir(dev, 1_000)
+    assert names(get_serial_ports()) == ['usb-Foo-if00']
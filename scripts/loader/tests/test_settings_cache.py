@@ -0,0 +1,58 @@
+from PyQt6.QtCore import QSettings
+
+from gui.settings_cache import SettingsCache
+
+
+class CountingSettings:
+    """QSettings wrapper that records every write pushed to it"""
+    
+    def __init__(self, settings):
+        self.settings = settings
+        self.writes = []
+    
+    def allKeys(self):
+        return self.settings.allKeys()
+    
+    def value(self, key):
+        return self.settings.value(key)
+    
+    def setValue(self, key, value):
+        self.writes.append(key)
+        self.settings.setValue(key, value)
+    
+    def sync(self):
+        self.settings.sync()
+
+
+def open_cache(path):
+    backend = CountingSettings(QSettings(str(path), QSettings.Format.IniFormat))
+    return SettingsCache(backend), backend
+
+
+def test_unchanged_values_read_back_as_strings_are_not_rewritten(tmp_path):
+    path = tmp_path / 'loader.ini'
+    path.write_text('[Receiver]\nport=9999\nrate=10.5\nenabled=true\nhost=127.0.0.1\n')
+    
+    cache, backend = open_cache(path)
+    assert cache.value('Receiver/port') == '9999'
+    
+    cache.setValue('Receiver/port', 9999)
+    cache.setValue('Receiver/rate', 10.5)
+    cache.setValue('Receiver/enabled', True)
+    cache.setValue('Receiver/host', '127.0.0.1')
+    cache.sync()
+    
+    assert backend.writes == []
+
+
+def test_changed_values_are_written(tmp_path):
+    path = tmp_path / 'loader.ini'
+    path.write_text('[Receiver]\nport=9999\nenabled=true\n')
+    
+    cache, backend = open_cache(path)
+    cache.setValue('Receiver/port', 9998)
+    cache.setValue('Receiver/enabled', False)
+    cache.sync()
+    
+    assert sorted(backend.writes) == ['Receiver/enabled', 'Receiver/port']
+    assert '9998' in path.read_text()
@@ -0,0 +1,63 @@
+import importlib.util
+import json
+import struct
+from pathlib import Path
+
+import pyarrow as pa
+
+import senders.ipc_stream as ipc_stream
+
+
+SCRIPT = Path(__file__).resolve().parents[2] / 'simulate_data_stream.py'
+
+
+def load_simulator():
+    spec = importlib.util.spec_from_file_location('simulate_data_stream', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_update(data):
+    """Split one update into its metadata and tables, the way the receiver reads it"""
+    (metadata_len,) = struct.unpack_from('<I', data, 0)
+    pos = 4 + metadata_len
+    metadata = json.loads(data[4:pos])
+    
+    tables = {}
+    while pos < len(data):
+        (name_len,) = struct.unpack_from('<I', data, pos)
+        name = data[pos + 4:pos + 4 + name_len].decode()
+        (stream_size,) = struct.unpack_from('<Q', data, pos + 4 + name_len)
+        pos += 4 + name_len + 8
+        tables[name] = pa.ipc.open_stream(data[pos:pos + stream_size]).read_all()
+        pos += stream_size
+    return metadata, tables
+
+
+def test_simulator_uses_the_loader_helpers():
+    simulator = load_simulator()
+    
+    assert simulator.send_buffers is ipc_stream.send_buffers
+    assert simulator.configure_socket is ipc_stream.configure_socket
+
+
+def test_prepared_update_decodes():
+    simulator = load_simulator()
+    streamer = simulator.NEDTrajectoryStreamer()
+    streamer.sock = object()
+    streamer.start_time_us -= 500_000
+    streamer.last_sent_time_us = streamer.start_time_us
+    
+    _, buffers, _ = streamer.prepare_update()
+    metadata, tables = read_update(b''.join(bytes(memoryview(buffer).cast('B')) for buffer in buffers))
+    
+    assert list(tables) == list(streamer.TRAJECTORY_NAMES)
+    assert metadata['table_names'] == list(streamer.TRAJECTORY_NAMES)
+    for table in tables.values():
+        assert table.schema.equals(streamer.SCHEMA)
+        timestamps = table.column('timestamp')
+        assert metadata['timeline_range'] == {
+            'min_timestamp': timestamps[0].as_py(),
+            'max_timestamp': timestamps[-1].as_py(),
+        }
@@ -28,6 +28,10 @@ struct PacketMetadata {
     #[allow(dead_code)]
     table_names: Vec<String>,
     timeline_range: TimelineRange,
+    /// Codec of compressed record batch bodies, if any. Arrow records the
+    /// codec in each batch, so this is only reported.
+    #[serde(default)]
+    compression: Option<String>,
 }
 
 pub fn start_tcp_server(sender: Sender<DataMessage>, ctx: egui::Context) {
@@ -70,7 +74,13 @@ async fn handle_connection(
     socket.read_exact(&mut meta_json).await?;
 
     let metadata: PacketMetadata = serde_json::from_slice(&meta_json)?;
-    println!("Received metadata: {} tables", metadata.table_count);
+    match &metadata.compression {
+        Some(codec) => println!(
+            "Received metadata: {} tables ({} compressed)",
+            metadata.table_count, codec
+        ),
+        None => println!("Received metadata: {} tables", metadata.table_count),
+    }
 
     sender
         .send(DataMessage::Metadata(metadata.timeline_range))
@@ -46,6 +46,21 @@ impl DataStore {
         time_offset: f32,
         entry: &mut HashMap<String, Vec<f32>>,
     ) {
+        // Dictionary-encoded columns (low-cardinality strings) are expanded
+        // back to their value type and handled like any other column
+        if let DataType::Dictionary(_, value_type) = column.data_type() {
+            match arrow::compute::cast(column, value_type) {
+                Ok(decoded) => {
+                    Self::convert_and_append_static(decoded.as_ref(), col_name, time_offset, entry)
+                }
+                Err(e) => eprintln!(
+                    "Warning: Could not decode dictionary column '{}': {}",
+                    col_name, e
+                ),
+            }
+            return;
+        }
+
         let target = entry.entry(col_name.to_string()).or_default();
 
         if let Some(arr) = column.as_any().downcast_ref::<Float32Array>() {